@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from .config import Config
-from .validator import get_files_by_format, AUDIO_FORMATS, validate_file_integrity
+from .validator import get_files_by_format, AUDIO_FORMATS, filter_valid_files
 from .utils import get_temp_file, run_ffmpeg_with_progress
 
 logger = logging.getLogger(__name__)
@@ -37,8 +37,8 @@ class AudioMixer:
         sound_files = get_files_by_format(self.config.sounds_dir, AUDIO_FORMATS)
 
         # Filter valid files
-        valid_music = [f for f in music_files if validate_file_integrity(f)]
-        valid_sounds = [f for f in sound_files if validate_file_integrity(f)]
+        valid_music = filter_valid_files(music_files)
+        valid_sounds = filter_valid_files(sound_files)
 
         if not valid_music and not valid_sounds:
             logger.info("No audio files to mix")
@@ -2,7 +2,7 @@
 
 import os
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
 from pathlib import Path
 
 
@@ -45,6 +45,13 @@ class Config:
     sounds_dir: Path = Path('sounds')
     temp_dir: Path = Path('.tmp')
 
+    # Persistent cache for ffmpeg results (disabled when None)
+    cache_dir: Optional[Path] = None
+
+    # Encoder settings for intermediate clips (re-encoded again in the final pass)
+    intermediate_preset: str = 'veryfast'
+    intermediate_crf: int = 20
+
     def __post_init__(self):
         """Initialize derived properties."""
         # Override directories from environment variables if set
@@ -58,10 +65,18 @@ class Config:
             self.sounds_dir = Path(os.environ['YT_BUILDER_SOUNDS_DIR'])
         if 'YT_BUILDER_TEMP_DIR' in os.environ:
             self.temp_dir = Path(os.environ['YT_BUILDER_TEMP_DIR'])
+        if 'YT_BUILDER_CACHE_DIR' in os.environ:
+            self.cache_dir = Path(os.environ['YT_BUILDER_CACHE_DIR'])
+        if 'YT_BUILDER_INTERMEDIATE_PRESET' in os.environ:
+            self.intermediate_preset = os.environ['YT_BUILDER_INTERMEDIATE_PRESET']
 
         # Ensure temp directory exists
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
+        # Ensure cache directory exists if caching is enabled
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
         # Convert output path to Path object
         if isinstance(self.output_path, str):
             self.output_path = Path(self.output_path)
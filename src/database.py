@@ -1,24 +1,109 @@
 """Database module for YouTube Video Builder"""
 
+import os
+import queue
 import sqlite3
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterator, List, Any, Tuple
 from contextlib import contextmanager
 
 
+# Applied to every new connection
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA foreign_keys=ON',
+)
+
+# Seconds to wait for a pooled connection before giving up
+POOL_ACQUIRE_TIMEOUT = 30
+
+
+class _ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections, opened on first use.
+
+    Re-entrant per thread: a nested acquire() on a thread that already holds
+    a connection gets that same connection back instead of waiting on itself.
+    """
+
+    def __init__(self, connect, size: int):
+        self._connect = connect
+        self._size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._held = threading.local()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a connection, reusing the one this thread already holds"""
+        if getattr(self._held, 'depth', 0):
+            self._held.depth += 1
+            return self._held.conn
+
+        conn = self._take()
+        self._held.conn = conn
+        self._held.depth = 1
+        return conn
+
+    def _take(self) -> sqlite3.Connection:
+        """Take an idle connection, opening one if the pool is not full yet"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self._size
+            if can_create:
+                self._created += 1
+
+        if not can_create:
+            # Pool exhausted, wait for a connection to be returned
+            try:
+                return self._idle.get(timeout=POOL_ACQUIRE_TIMEOUT)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"No database connection available after {POOL_ACQUIRE_TIMEOUT}s"
+                ) from None
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool once the outermost holder releases it"""
+        self._held.depth -= 1
+        if self._held.depth == 0:
+            self._held.conn = None
+            self._idle.put(conn)
+
+
 class Database:
     """SQLite database for tracking jobs and uploads"""
 
-    def __init__(self, db_path: str = 'data/yt-builder.db'):
+    def __init__(self, db_path: str = 'data/yt-builder.db', read_pool_size: Optional[int] = None):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # WAL lets readers run alongside the single writer
+        self._write_pool = _ConnectionPool(self._connect, 1)
+        self._read_pool = _ConnectionPool(self._connect, read_pool_size or os.cpu_count() or 4)
+
         self._init_db()
 
     def _init_db(self):
         """Initialize database schema"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
 
             # Jobs table
@@ -86,21 +171,51 @@ class Database:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_youtube_job ON youtube_uploads(job_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_youtube_creds_user ON youtube_credentials(user_id)')
 
-            conn.commit()
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with server PRAGMAs applied"""
+        # Autocommit mode; write() manages transactions explicitly
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
 
     @contextmanager
-    def _get_connection(self):
-        """Get database connection with context manager"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def read(self):
+        """Get a pooled connection for read-only queries"""
+        conn = self._read_pool.acquire()
         try:
             yield conn
         finally:
-            conn.close()
+            self._read_pool.release(conn)
+
+    @contextmanager
+    def write(self):
+        """Get the writer connection inside a transaction, committed on success"""
+        conn = self._write_pool.acquire()
+        if conn.in_transaction:
+            # Nested write() on this thread: join the outer transaction
+            try:
+                yield conn
+            finally:
+                self._write_pool.release(conn)
+            return
+
+        try:
+            # Take the write lock up front so the transaction can't hit SQLITE_BUSY midway
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            self._write_pool.release(conn)
 
     def create_job(self, job_id: int, run_id: str, run_dir: str, config: Dict) -> bool:
         """Create a new job"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO jobs (job_id, run_id, run_dir, status, config, created_at)
@@ -113,12 +228,11 @@ class Database:
                 json.dumps(config),
                 datetime.now().isoformat()
             ))
-            conn.commit()
             return True
 
     def get_job(self, job_id: int) -> Optional[Dict]:
         """Get job by ID"""
-        with self._get_connection() as conn:
+        with self.read() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,))
             row = cursor.fetchone()
@@ -129,7 +243,7 @@ class Database:
 
     def get_all_jobs(self, limit: int = 100) -> List[Dict]:
         """Get all jobs, newest first"""
-        with self._get_connection() as conn:
+        with self.read() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM jobs
@@ -171,64 +285,65 @@ class Database:
 
         values.append(job_id)
 
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute(f'''
                 UPDATE jobs
                 SET {', '.join(fields)}
                 WHERE job_id = ?
             ''', values)
-            conn.commit()
             return cursor.rowcount > 0
 
     def update_job_config(self, job_id: int, config: Dict) -> bool:
         """Update job configuration"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE jobs
                 SET config = ?
                 WHERE job_id = ?
             ''', (json.dumps(config), job_id))
-            conn.commit()
             return cursor.rowcount > 0
 
     def add_file(self, job_id: int, file_type: str, filename: str, file_path: str) -> bool:
         """Add a file to job tracking"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            try:
-                cursor.execute('''
-                    INSERT INTO job_files (job_id, file_type, filename, file_path, uploaded_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    job_id,
-                    file_type,
-                    filename,
-                    file_path,
-                    datetime.now().isoformat()
-                ))
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                # File already exists, update it
-                cursor.execute('''
-                    UPDATE job_files
-                    SET file_path = ?, uploaded_at = ?
-                    WHERE job_id = ? AND file_type = ? AND filename = ?
-                ''', (
-                    file_path,
-                    datetime.now().isoformat(),
-                    job_id,
-                    file_type,
-                    filename
-                ))
-                conn.commit()
-                return True
+        with self.write() as conn:
+            # Re-adding a file updates it; a missing job still fails the foreign key
+            conn.execute('''
+                INSERT INTO job_files (job_id, file_type, filename, file_path, uploaded_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (job_id, file_type, filename)
+                DO UPDATE SET file_path = excluded.file_path, uploaded_at = excluded.uploaded_at
+            ''', (
+                job_id,
+                file_type,
+                filename,
+                file_path,
+                datetime.now().isoformat()
+            ))
+            return True
+
+    def add_files_bulk(self, job_id: int, file_type: str, rows: List[Tuple[str, str]]) -> int:
+        """Add (filename, file_path) rows to job tracking in one transaction"""
+        if not rows:
+            return 0
+
+        uploaded_at = datetime.now().isoformat()
+        with self.write() as conn:
+            conn.executemany('''
+                INSERT INTO job_files (job_id, file_type, filename, file_path, uploaded_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (job_id, file_type, filename)
+                DO UPDATE SET file_path = excluded.file_path, uploaded_at = excluded.uploaded_at
+            ''', [
+                (job_id, file_type, filename, file_path, uploaded_at)
+                for filename, file_path in rows
+            ])
+            return len(rows)
 
     def get_job_files(self, job_id: int, file_type: Optional[str] = None) -> List[Dict]:
         """Get files for a job"""
-        with self._get_connection() as conn:
+        with self.read() as conn:
             cursor = conn.cursor()
 
             if file_type:
@@ -248,18 +363,17 @@ class Database:
 
     def delete_file(self, job_id: int, file_type: str, filename: str) -> bool:
         """Delete a file from tracking"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 DELETE FROM job_files
                 WHERE job_id = ? AND file_type = ? AND filename = ?
             ''', (job_id, file_type, filename))
-            conn.commit()
             return cursor.rowcount > 0
 
     def get_file_counts(self, job_id: int) -> Dict[str, int]:
         """Get count of files by type for a job"""
-        with self._get_connection() as conn:
+        with self.read() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT file_type, COUNT(*) as count
@@ -280,11 +394,42 @@ class Database:
 
             return counts
 
+    def get_all_jobs_with_counts(self, limit: int = 100) -> List[Dict]:
+        """Get all jobs, newest first, each with its file counts by type"""
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT j.*,
+                       COALESCE(SUM(f.file_type = 'videos'), 0) AS videos_count,
+                       COALESCE(SUM(f.file_type = 'music'), 0) AS music_count,
+                       COALESCE(SUM(f.file_type = 'sounds'), 0) AS sounds_count,
+                       COALESCE(SUM(f.file_type = 'quotes'), 0) AS quotes_count
+                FROM (
+                    SELECT * FROM jobs
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                ) j
+                LEFT JOIN job_files f ON f.job_id = j.job_id
+                GROUP BY j.job_id
+                ORDER BY j.created_at DESC
+            ''', (limit,))
+
+            jobs = []
+            for row in cursor.fetchall():
+                job = self._row_to_dict(row)
+                job['file_counts'] = {
+                    file_type: job.pop(f'{file_type}_count')
+                    for file_type in ('videos', 'music', 'sounds', 'quotes')
+                }
+                jobs.append(job)
+
+            return jobs
+
     def add_youtube_upload(self, job_id: int, video_id: str, video_url: str,
                           title: str, description: str, privacy: str,
                           tags: List[str], category: str) -> bool:
         """Record a YouTube upload"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO youtube_uploads
@@ -301,12 +446,11 @@ class Database:
                 category,
                 datetime.now().isoformat()
             ))
-            conn.commit()
             return True
 
     def get_youtube_uploads(self, job_id: Optional[int] = None) -> List[Dict]:
         """Get YouTube uploads"""
-        with self._get_connection() as conn:
+        with self.read() as conn:
             cursor = conn.cursor()
 
             if job_id:
@@ -332,16 +476,34 @@ class Database:
 
     def get_next_job_id(self) -> int:
         """Get the next available job ID"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT MAX(job_id) as max_id FROM jobs')
             row = cursor.fetchone()
             max_id = row['max_id'] if row['max_id'] is not None else 0
             return max_id + 1
 
+    def iter_active_jobs(self, limit: int = 50, batch_size: int = 32) -> Iterator[Dict]:
+        """Yield preparing or queued jobs, newest first, fetching rows in batches"""
+        with self.read() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM jobs
+                WHERE status IN ('preparing', 'queued')
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (limit,))
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_dict(row)
+
     def get_old_preparing_jobs(self, hours: int = 1) -> List[Dict]:
         """Get preparing jobs older than specified hours"""
-        with self._get_connection() as conn:
+        with self.read() as conn:
             cursor = conn.cursor()
             cutoff = datetime.now().timestamp() - (hours * 60 * 60)
             cutoff_iso = datetime.fromtimestamp(cutoff).isoformat()
@@ -356,15 +518,14 @@ class Database:
 
     def delete_job(self, job_id: int) -> bool:
         """Delete a job and its associated data (CASCADE will handle related records)"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
-            conn.commit()
             return cursor.rowcount > 0
 
     def cleanup_old_jobs(self, days: int = 30) -> int:
         """Delete jobs older than specified days"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cutoff = datetime.now().timestamp() - (days * 24 * 60 * 60)
             cutoff_iso = datetime.fromtimestamp(cutoff).isoformat()
@@ -374,12 +535,11 @@ class Database:
                 WHERE finished_at < ? AND finished_at IS NOT NULL
             ''', (cutoff_iso,))
 
-            conn.commit()
             return cursor.rowcount
 
     def save_youtube_credentials(self, user_id: str, credentials_json: str) -> bool:
         """Save YouTube OAuth credentials for a user"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO youtube_credentials (user_id, credentials_json, updated_at)
@@ -389,12 +549,11 @@ class Database:
                 credentials_json,
                 datetime.now().isoformat()
             ))
-            conn.commit()
             return True
 
     def get_youtube_credentials(self, user_id: str) -> Optional[str]:
         """Get YouTube OAuth credentials for a user"""
-        with self._get_connection() as conn:
+        with self.read() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT credentials_json FROM youtube_credentials
@@ -407,10 +566,9 @@ class Database:
 
     def delete_youtube_credentials(self, user_id: str) -> bool:
         """Delete YouTube OAuth credentials for a user"""
-        with self._get_connection() as conn:
+        with self.write() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM youtube_credentials WHERE user_id = ?', (user_id,))
-            conn.commit()
             return cursor.rowcount > 0
 
     def _row_to_dict(self, row: sqlite3.Row) -> Dict:
@@ -154,13 +154,31 @@ def validate_file_integrity(file_path: Path) -> bool:
         True if file is valid, False otherwise
     """
     # Basic check: file exists and has non-zero size
-    if not file_path.exists():
+    try:
+        size = file_path.stat().st_size
+    except FileNotFoundError:
         logger.error(f"File does not exist: {file_path}")
         return False
+    except OSError as e:
+        logger.error(f"Cannot access file {file_path}: {e}")
+        return False
 
-    if file_path.stat().st_size == 0:
+    if size == 0:
         logger.error(f"File is empty: {file_path}")
         return False
 
     # Could add more sophisticated checks with ffprobe here
     return True
+
+
+def filter_valid_files(file_paths: List[Path]) -> List[Path]:
+    """
+    Check media files and keep the valid ones.
+
+    Args:
+        file_paths: List of media file paths
+
+    Returns:
+        Valid file paths, in their original order
+    """
+    return [path for path in file_paths if validate_file_integrity(path)]
@@ -1,17 +1,90 @@
 """Video processing module for YouTube Video Builder"""
 
+import hashlib
+import itertools
 import logging
+import os
 import random
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from .config import Config
-from .validator import get_files_by_format, VIDEO_FORMATS, validate_file_integrity
+from .validator import get_files_by_format, VIDEO_FORMATS, filter_valid_files
 from .utils import get_temp_file, run_ffmpeg_with_progress
 
 logger = logging.getLogger(__name__)
 
+# xfade transition used for each --transition option
+XFADE_TRANSITIONS = {
+    'fade': 'fade',
+    'crossfade': 'fadeblack',
+}
+
+# Length of the overlap between two clips when a transition is used (seconds)
+TRANSITION_DURATION = 1.0
+
+# Maximum number of ffprobe processes running at the same time
+PROBE_WORKERS = 8
+
+# Number of ffmpeg encoders running at the same time (clips are encoded one by one)
+ENCODER_WORKERS = 1
+
+# libx264 picks 1.5 threads per core on its own, but stops scaling past about this many
+X264_AUTO_THREAD_CEILING = 16
+
+# Maximum number of clips opened by a single ffmpeg invocation
+CONCAT_BATCH_SIZE = 25  # Very conservative batch size to avoid file limit issues
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """Stat a path, returning None if it does not exist."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _stat_many(paths: List[Path]) -> Dict[Path, Optional[os.stat_result]]:
+    """
+    Stat many paths, each unique path only once.
+
+    Args:
+        paths: List of file paths (duplicates allowed)
+
+    Returns:
+        Mapping of path to stat result, or None if the path is missing
+    """
+    return {p: _stat_or_none(p) for p in dict.fromkeys(paths)}
+
+
+def _ffmpeg_cache_key(cmd: List[str], output_file: Path, inputs: List[Path]) -> str:
+    """
+    Compute a cache key for an ffmpeg command.
+
+    The output path is left out (it is a fresh temp file on every run) and
+    each input is identified by its path, size and modification time.
+
+    Args:
+        cmd: ffmpeg command as list
+        output_file: Output file path used in the command
+        inputs: Input files read by the command
+
+    Returns:
+        Hex digest identifying the command and its inputs
+    """
+    output_arg = str(output_file)
+    args = ['<output>' if arg == output_arg else arg for arg in cmd]
+
+    digest = hashlib.blake2b(repr(args).encode('utf-8'), digest_size=20)
+    for path in inputs:
+        stat = os.stat(path)
+        digest.update(f"|{path.absolute()}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+
+    return digest.hexdigest()
+
 
 class VideoProcessor:
     """Handles video processing operations."""
@@ -36,7 +109,7 @@ class VideoProcessor:
         video_files = get_files_by_format(self.config.videos_dir, VIDEO_FORMATS)
 
         # Filter out corrupted files
-        valid_videos = [v for v in video_files if validate_file_integrity(v)]
+        valid_videos = filter_valid_files(video_files)
 
         if not valid_videos:
             raise RuntimeError("No valid video files found")
@@ -53,44 +126,55 @@ class VideoProcessor:
 
         logger.info(f"Processing {len(valid_videos)} video file(s)")
 
-        # Process each unique video once (normalize resolution/fps)
-        logger.info("Normalizing videos to target resolution and fps...")
-        processed_cache = {}
-        for video_path in valid_videos:
-            logger.info(f"Processing video: {video_path.name}")
-            processed_cache[video_path] = self._process_single_video(video_path)
-
-        # Get durations of processed videos
-        video_durations = [self._get_duration(processed_cache[v]) for v in valid_videos]
+        # Get durations of the raw inputs. Normalization (scale/pad/fps) keeps
+        # the duration, so clips can be selected before anything is encoded.
+        video_durations = self._get_durations(valid_videos)
         total_duration = sum(video_durations)
 
         logger.info(f"Total video duration: {total_duration:.2f}s, Target: {self.config.duration}s")
 
-        # Determine which videos to use and how many times to loop
+        if total_duration <= 0:
+            raise RuntimeError("Video files have no playable duration")
+
         if total_duration < self.config.duration:
-            # Need to loop videos - use already processed versions
-            loops_needed = int(self.config.duration / total_duration) + 1
-            logger.info(f"Looping video sequence {loops_needed} times")
-            # Create list of already-processed videos
-            final_videos = [processed_cache[v] for v in valid_videos] * loops_needed
-            final_durations = video_durations * loops_needed
-        else:
-            final_videos = [processed_cache[v] for v in valid_videos]
-            final_durations = video_durations
+            logger.info(f"Looping video sequence {int(self.config.duration / total_duration) + 1} times")
 
-        # Trim to fit duration
-        selected_videos = []
-        selected_durations = []
+        # Walk the (looped) sequence until the target duration is covered.
+        # Transitions overlap consecutive clips, shortening the output.
+        overlap = self._transition_overlap(video_durations)
+        selected_raw_videos = []
         accumulated_time = 0.0
+        for video, accumulated_time in self._select_clips(valid_videos, video_durations, overlap):
+            selected_raw_videos.append(video)
 
-        for video, duration in zip(final_videos, final_durations):
-            if accumulated_time >= self.config.duration:
-                break
-            selected_videos.append(video)
-            selected_durations.append(duration)
-            accumulated_time += duration
+        logger.info(f"Selected {len(selected_raw_videos)} video clip(s) for output")
+
+        # Normalizing in the join pass re-encodes every occurrence of a clip. That's
+        # free when xfade re-encodes the whole output anyway; without transitions,
+        # looped clips are cheaper encoded once each and joined with stream copy
+        has_repeats = len(set(selected_raw_videos)) < len(selected_raw_videos)
+        single_pass = self.config.transition in XFADE_TRANSITIONS or not has_repeats
+
+        if self.config.cache_dir is None and single_pass and 1 < len(selected_raw_videos) <= CONCAT_BATCH_SIZE:
+            # Normalize and join in one pass, without intermediate clip files
+            duration_by_video = dict(zip(valid_videos, video_durations))
+            selected_durations = [duration_by_video[v] for v in selected_raw_videos]
+            output_file = self._normalize_and_concatenate(selected_raw_videos, selected_durations, overlap)
+
+            # Trim to exact duration if needed
+            if accumulated_time > self.config.duration:
+                output_file = self._trim_video(output_file, self.config.duration)
+
+            return output_file
+
+        # Process each selected video once (normalize resolution/fps)
+        logger.info("Normalizing videos to target resolution and fps...")
+        processed_cache = {}
+        for video_path in dict.fromkeys(selected_raw_videos):
+            logger.info(f"Processing video: {video_path.name}")
+            processed_cache[video_path] = self._process_single_video(video_path)
 
-        logger.info(f"Selected {len(selected_videos)} video clip(s) for output")
+        selected_videos = [processed_cache[v] for v in selected_raw_videos]
 
         # Combine videos
         if len(selected_videos) == 1 and accumulated_time <= self.config.duration:
@@ -98,7 +182,7 @@ class VideoProcessor:
             output_file = selected_videos[0]
         else:
             # Multiple videos, need to concatenate (all already processed)
-            output_file = self._concatenate_videos_preprocessed(selected_videos)
+            output_file = self._concatenate_videos_preprocessed(selected_videos, overlap)
 
         # Trim to exact duration if needed
         if accumulated_time > self.config.duration:
@@ -106,10 +190,70 @@ class VideoProcessor:
 
         return output_file
 
+    def _select_clips(self, videos: List[Path], durations: List[float],
+                      overlap: float = 0.0) -> Iterator[Tuple[Path, float]]:
+        """
+        Yield clips in order, looping the sequence, until the target duration is covered.
+
+        Args:
+            videos: Video file paths in playback order
+            durations: Duration of each video in seconds
+            overlap: Seconds lost to the transition before every clip but the first
+
+        Yields:
+            Tuples of (video path, output length so far including this clip)
+        """
+        accumulated_time = 0.0
+        for index, (video, duration) in enumerate(itertools.cycle(zip(videos, durations))):
+            if accumulated_time >= self.config.duration:
+                return
+            accumulated_time += duration if index == 0 else duration - overlap
+            yield video, accumulated_time
+
+    def _transition_overlap(self, durations: List[float]) -> float:
+        """
+        Get the transition length, shortened so no clip is consumed entirely.
+
+        Args:
+            durations: Duration of each clip in seconds
+
+        Returns:
+            Overlap between consecutive clips in seconds (0 without transitions)
+        """
+        if self.config.transition not in XFADE_TRANSITIONS or not durations:
+            return 0.0
+        return min(TRANSITION_DURATION, min(durations) / 2)
+
+    def _get_durations(self, video_paths: List[Path]) -> List[float]:
+        """
+        Get durations of many video files.
+
+        Each unique file is probed once, and the probes run concurrently so
+        ffprobe's process startup cost overlaps instead of adding up per clip.
+
+        Args:
+            video_paths: List of video file paths (duplicates allowed)
+
+        Returns:
+            Duration in seconds of each path, in order
+        """
+        unique_paths = list(dict.fromkeys(video_paths))
+        if not unique_paths:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(unique_paths))) as executor:
+            durations = dict(zip(unique_paths, executor.map(self._get_duration, unique_paths)))
+
+        return [durations[v] for v in video_paths]
+
     def _get_duration(self, video_path: Path) -> float:
         """
         Get duration of a video file using ffprobe.
 
+        The video stream's duration is used, since xfade offsets must match the
+        frames actually present; the container duration is the fallback for
+        formats that don't store a per-stream duration.
+
         Args:
             video_path: Path to video file
 
@@ -119,14 +263,21 @@ class VideoProcessor:
         cmd = [
             'ffprobe',
             '-v', 'error',
-            '-show_entries', 'format=duration',
+            '-select_streams', 'v:0',
+            '-show_entries', 'stream=duration:format=duration',
+            # Durations come from the headers; don't read past the first packet
+            '-read_intervals', '%+#1',
             '-of', 'default=noprint_wrappers=1:nokey=1',
             str(video_path)
         ]
 
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return float(result.stdout.strip())
+            # Stream section is printed before format; either may be N/A
+            values = [v for v in result.stdout.split() if v != 'N/A']
+            if not values:
+                raise ValueError(f"no duration reported: {result.stdout.strip()!r}")
+            return float(values[0])
         except (subprocess.CalledProcessError, ValueError) as e:
             logger.error(f"Failed to get duration for {video_path}: {e}")
             raise
@@ -151,45 +302,22 @@ class VideoProcessor:
             '-i', str(video_path),
             '-vf', f'scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2',
             '-r', str(self.config.fps),
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
+            *self._intermediate_encode_args(),
             '-an',  # Remove audio for now
             '-y',
             str(output_file)
         ]
 
-        self._run_ffmpeg(cmd, f"Processing {video_path.name}")
-        return output_file
-
-    def _concatenate_videos(self, video_paths: List[Path]) -> Path:
-        """
-        Concatenate multiple videos with transitions.
-        Legacy method - processes videos before concatenating.
-
-        Args:
-            video_paths: List of video file paths
+        return self._run_ffmpeg_cached(cmd, output_file, [video_path], f"Processing {video_path.name}")
 
-        Returns:
-            Path to concatenated video
-        """
-        logger.info(f"Concatenating {len(video_paths)} videos with {self.config.transition} transition")
-
-        # First, normalize all videos to same resolution and fps
-        normalized_videos = []
-        for video_path in video_paths:
-            normalized = self._process_single_video(video_path)
-            normalized_videos.append(normalized)
-
-        return self._concatenate_videos_preprocessed(normalized_videos)
-
-    def _concatenate_videos_preprocessed(self, processed_videos: List[Path]) -> Path:
+    def _concatenate_videos_preprocessed(self, processed_videos: List[Path], overlap: float) -> Path:
         """
         Concatenate multiple already-processed videos with transitions.
         Uses batch processing for large numbers of clips to avoid resource limits.
 
         Args:
             processed_videos: List of already-processed video file paths
+            overlap: Transition length in seconds, as used to select the clips
 
         Returns:
             Path to concatenated video
@@ -198,34 +326,26 @@ class VideoProcessor:
         logger.info(f"Concatenating {num_videos} videos with {self.config.transition} transition")
 
         # For very large numbers of videos, process in batches to avoid system limits
-        BATCH_SIZE = 25  # Very conservative batch size to avoid file limit issues
-
-        if num_videos > BATCH_SIZE:
-            logger.info(f"⚠️  BATCH MODE: Processing {num_videos} videos in batches of {BATCH_SIZE}")
-            logger.info(f"This will create {(num_videos + BATCH_SIZE - 1) // BATCH_SIZE} batch(es)")
-            return self._concatenate_in_batches(processed_videos, BATCH_SIZE)
+        if num_videos > CONCAT_BATCH_SIZE:
+            logger.info(f"⚠️  BATCH MODE: Processing {num_videos} videos in batches of {CONCAT_BATCH_SIZE}")
+            logger.info(f"This will create {(num_videos + CONCAT_BATCH_SIZE - 1) // CONCAT_BATCH_SIZE} batch(es)")
+            return self._concatenate_in_batches(processed_videos, CONCAT_BATCH_SIZE, overlap)
 
         if num_videos > 10:
             logger.info(f"This may take a few minutes for {num_videos} clips. Progress will be shown below...")
 
         # Validate all files exist
-        missing_files = [v for v in processed_videos if not v.exists()]
+        stats = _stat_many(processed_videos)
+        missing_files = [v for v in stats if stats[v] is None]
         if missing_files:
             raise RuntimeError(f"Missing input file(s): {', '.join(str(f) for f in missing_files)}")
 
-        # Create concat file
-        concat_file = get_temp_file(self.config, '.txt')
-        with open(concat_file, 'w') as f:
-            for video in processed_videos:
-                # Escape single quotes in file paths for concat demuxer
-                video_path = str(video.absolute()).replace("'", "'\\''")
-                f.write(f"file '{video_path}'\n")
-
         # Concatenate
         output_file = get_temp_file(self.config, '.mp4')
 
         if self.config.transition == 'none':
             # Simple concatenation
+            concat_file = self._write_concat_list(processed_videos)
             cmd = [
                 'ffmpeg',
                 '-f', 'concat',
@@ -235,22 +355,22 @@ class VideoProcessor:
                 '-y',
                 str(output_file)
             ]
-        elif self.config.transition == 'fade':
+        else:
             # Use xfade filter for transitions
-            cmd = self._build_xfade_command(processed_videos, output_file, 'fade')
-        else:  # crossfade
-            cmd = self._build_xfade_command(processed_videos, output_file, 'fadeblack')
+            transition_type = XFADE_TRANSITIONS[self.config.transition]
+            cmd = self._build_xfade_command(processed_videos, output_file, transition_type, overlap, stats)
 
         self._run_ffmpeg(cmd, "Concatenating videos")
         return output_file
 
-    def _concatenate_in_batches(self, processed_videos: List[Path], batch_size: int) -> Path:
+    def _concatenate_in_batches(self, processed_videos: List[Path], batch_size: int, overlap: float) -> Path:
         """
         Concatenate videos in batches to handle very large numbers of clips.
 
         Args:
             processed_videos: List of already-processed video file paths
             batch_size: Number of videos to process per batch
+            overlap: Transition length in seconds, as used to select the clips
 
         Returns:
             Path to final concatenated video
@@ -260,6 +380,9 @@ class VideoProcessor:
 
         logger.info(f"Splitting {num_videos} videos into {num_batches} batch(es)")
 
+        # Stat every input once up front; looped sequences repeat the same clips
+        stats = _stat_many(processed_videos)
+
         # Process each batch
         batch_outputs = []
         for i in range(num_batches):
@@ -270,7 +393,7 @@ class VideoProcessor:
             logger.info(f"Processing batch {i + 1}/{num_batches} ({len(batch)} clips)...")
 
             # Validate all files exist before processing
-            missing_files = [v for v in batch if not v.exists()]
+            missing_files = [v for v in dict.fromkeys(batch) if stats[v] is None]
             if missing_files:
                 raise RuntimeError(
                     f"Batch {i + 1}/{num_batches}: Missing input file(s): "
@@ -278,15 +401,11 @@ class VideoProcessor:
                 )
 
             # Create concat file for this batch
-            concat_file = get_temp_file(self.config, '.txt')
-            with open(concat_file, 'w') as f:
-                for video in batch:
-                    # Escape single quotes in file paths for concat demuxer
-                    video_path = str(video.absolute()).replace("'", "'\\''")
-                    f.write(f"file '{video_path}'\n")
+            concat_file = self._write_concat_list(batch)
 
             # Verify concat file was created and is readable
-            if not concat_file.exists() or concat_file.stat().st_size == 0:
+            concat_stat = _stat_or_none(concat_file)
+            if concat_stat is None or concat_stat.st_size == 0:
                 raise RuntimeError(f"Failed to create concat file for batch {i + 1}/{num_batches}: {concat_file}")
 
             # Concatenate this batch
@@ -303,25 +422,17 @@ class VideoProcessor:
                     str(batch_output)
                 ]
             else:
-                # For transitions, use simple concat within batch
-                cmd = [
-                    'ffmpeg',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', str(concat_file),
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-y',
-                    str(batch_output)
-                ]
+                # Transitions within the batch; batches are joined with plain cuts
+                transition_type = XFADE_TRANSITIONS[self.config.transition]
+                cmd = self._build_xfade_command(batch, batch_output, transition_type, overlap, stats)
 
             try:
                 self._run_ffmpeg(cmd, f"Batch {i + 1}/{num_batches}")
                 # Verify batch output was created and is valid
-                if not batch_output.exists():
+                batch_stat = _stat_or_none(batch_output)
+                if batch_stat is None:
                     raise RuntimeError(f"Batch {i + 1}/{num_batches} output file was not created: {batch_output}")
-                if batch_output.stat().st_size == 0:
+                if batch_stat.st_size == 0:
                     raise RuntimeError(f"Batch {i + 1}/{num_batches} output file is empty: {batch_output}")
                 batch_outputs.append(batch_output)
             except Exception as e:
@@ -337,18 +448,14 @@ class VideoProcessor:
 
         # Final concatenation of batches
         # Validate all batch outputs exist
-        missing_batches = [b for b in batch_outputs if not b.exists()]
+        batch_stats = _stat_many(batch_outputs)
+        missing_batches = [b for b in batch_stats if batch_stats[b] is None]
         if missing_batches:
             raise RuntimeError(
                 f"Missing batch output file(s): {', '.join(str(f) for f in missing_batches)}"
             )
 
-        final_concat_file = get_temp_file(self.config, '.txt')
-        with open(final_concat_file, 'w') as f:
-            for batch_output in batch_outputs:
-                # Escape single quotes in file paths for concat demuxer
-                batch_path = str(batch_output.absolute()).replace("'", "'\\''")
-                f.write(f"file '{batch_path}'\n")
+        final_concat_file = self._write_concat_list(batch_outputs)
 
         final_output = get_temp_file(self.config, '.mp4')
 
@@ -365,47 +472,186 @@ class VideoProcessor:
         self._run_ffmpeg(cmd, "Final concatenation")
         return final_output
 
-    def _build_xfade_command(self, video_paths: List[Path], output_file: Path, transition_type: str) -> List[str]:
+    def _build_xfade_command(self, video_paths: List[Path], output_file: Path, transition_type: str,
+                             overlap: float,
+                             stats: Optional[Dict[Path, Optional[os.stat_result]]] = None) -> List[str]:
         """
         Build ffmpeg command for crossfade transitions.
+        All clips are chained through xfade in a single filtergraph and encoded once.
 
         Args:
             video_paths: List of normalized video paths
             output_file: Output file path
-            transition_type: Type of transition
+            transition_type: Type of transition (xfade transition name)
+            overlap: Transition length in seconds
+            stats: Stat results already gathered by the caller (optional)
 
         Returns:
             ffmpeg command as list
         """
-        # For simplicity with xfade, we'll use a basic concat with fade
-        # A full xfade implementation is complex, so we'll do a simple version
-        # Validate all files exist
-        missing_files = [v for v in video_paths if not v.exists()]
+        # Validate all files exist (reusing the caller's stats when available)
+        if stats is None:
+            stats = _stat_many(video_paths)
+        missing_files = [v for v in dict.fromkeys(video_paths) if stats.get(v) is None]
         if missing_files:
             raise RuntimeError(f"Missing input file(s): {', '.join(str(f) for f in missing_files)}")
 
-        concat_file = get_temp_file(self.config, '.txt')
-        with open(concat_file, 'w') as f:
-            for video in video_paths:
-                # Escape single quotes in file paths for concat demuxer
-                video_path = str(video.absolute()).replace("'", "'\\''")
-                f.write(f"file '{video_path}'\n")
+        # xfade offsets depend on the real length of each normalized clip
+        durations = self._get_durations(video_paths)
 
-        # Simple concatenation with fade between segments
-        cmd = [
-            'ffmpeg',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', str(concat_file),
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
+        cmd = ['ffmpeg']
+        for video in video_paths:
+            cmd.extend(['-i', str(video)])
+
+        # Give every input an identical timebase/format, as xfade requires
+        filters = [f"[{i}:v]settb=AVTB,setsar=1,format=yuv420p[v{i}]" for i in range(len(video_paths))]
+        last_label = self._append_xfade_chain(filters, durations, transition_type, overlap)
+
+        cmd.extend([
+            '-filter_complex', ';'.join(filters),
+            '-map', f'[{last_label}]',
+            *self._intermediate_encode_args(),
             '-y',
             str(output_file)
-        ]
+        ])
 
         return cmd
 
+    def _append_xfade_chain(self, filters: List[str], durations: List[float],
+                            transition_type: str, overlap: float) -> str:
+        """
+        Append xfade filters joining inputs labelled [v0]..[vN-1] in order.
+
+        Args:
+            filters: Filtergraph chains to append to
+            durations: Duration of each input in seconds
+            transition_type: Type of transition (xfade transition name)
+            overlap: Transition length in seconds
+
+        Returns:
+            Label of the final output pad
+        """
+        # Each offset is where the running output ends, minus the overlap
+        last_label = 'v0'
+        offset = durations[0]
+        for i in range(1, len(durations)):
+            offset -= overlap
+            label = f"x{i}"
+            filters.append(
+                f"[{last_label}][v{i}]xfade=transition={transition_type}"
+                f":duration={overlap:.3f}:offset={offset:.3f}[{label}]"
+            )
+            last_label = label
+            offset += durations[i]
+
+        return last_label
+
+    def _normalize_and_concatenate(self, video_paths: List[Path], durations: List[float],
+                                   overlap: float) -> Path:
+        """
+        Normalize and join raw clips in a single ffmpeg pass.
+        Each clip is scaled/padded in the filtergraph, so no intermediate
+        normalized files are written to disk.
+
+        Args:
+            video_paths: List of raw video paths in playback order (repeats allowed)
+            durations: Duration of each video in seconds
+            overlap: Transition length in seconds, as used to select the clips
+
+        Returns:
+            Path to concatenated video
+        """
+        num_videos = len(video_paths)
+        logger.info(f"Normalizing and concatenating {num_videos} videos with {self.config.transition} transition")
+
+        width, height = self.config.resolution
+        output_file = get_temp_file(self.config, '.mp4')
+
+        cmd = ['ffmpeg']
+        for video in video_paths:
+            cmd.extend(['-i', str(video)])
+
+        filters = [
+            f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,fps={self.config.fps},"
+            f"settb=AVTB,setsar=1,format=yuv420p[v{i}]"
+            for i in range(num_videos)
+        ]
+
+        if self.config.transition in XFADE_TRANSITIONS:
+            last_label = self._append_xfade_chain(
+                filters, durations, XFADE_TRANSITIONS[self.config.transition], overlap
+            )
+        else:
+            inputs = ''.join(f"[v{i}]" for i in range(num_videos))
+            filters.append(f"{inputs}concat=n={num_videos}:v=1:a=0[out]")
+            last_label = 'out'
+
+        cmd.extend([
+            '-filter_complex', ';'.join(filters),
+            '-map', f'[{last_label}]',
+            *self._intermediate_encode_args(),
+            '-an',
+            '-y',
+            str(output_file)
+        ])
+
+        self._run_ffmpeg(cmd, "Normalizing and concatenating videos")
+        return output_file
+
+    def _intermediate_encode_args(self) -> List[str]:
+        """
+        Get video encoder options for intermediate files.
+
+        Intermediate clips are re-encoded by combine_all, so a faster preset
+        is used here; the slightly lower CRF keeps quality for that final pass.
+
+        Returns:
+            ffmpeg arguments as list
+        """
+        return [
+            '-c:v', 'libx264',
+            '-preset', self.config.intermediate_preset,
+            '-crf', str(self.config.intermediate_crf),
+            *self._x264_thread_args(),
+        ]
+
+    def _x264_thread_args(self) -> List[str]:
+        """
+        Get libx264 threading options sized for this host.
+
+        The automatic thread count (1.5 per core) is kept unless it would exceed
+        the point where libx264 stops scaling; only larger hosts get an explicit
+        count, using the same factor. Lookahead threads are left on auto.
+
+        Returns:
+            ffmpeg arguments as list (empty to keep libx264's own choice)
+        """
+        threads = (os.cpu_count() or 1) * 3 // 2 // ENCODER_WORKERS
+        if threads <= X264_AUTO_THREAD_CEILING:
+            return []
+        return ['-threads', str(threads)]
+
+    def _write_concat_list(self, paths: List[Path]) -> Path:
+        """
+        Write a concat demuxer list file for the given paths.
+
+        Args:
+            paths: List of video file paths
+
+        Returns:
+            Path to concat list file
+        """
+        # Escape single quotes the way the concat demuxer expects ('\'')
+        lines = (
+            "file '" + str(path.absolute()).replace("'", "'\\''") + "'"
+            for path in paths
+        )
+
+        concat_file = get_temp_file(self.config, '.txt')
+        concat_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        return concat_file
+
     def _trim_video(self, video_path: Path, duration: float) -> Path:
         """
         Trim video to specified duration.
@@ -476,6 +722,7 @@ class VideoProcessor:
             '-c:v', 'libx264',
             '-preset', 'medium',
             '-crf', '23',
+            *self._x264_thread_args(),
         ])
 
         if audio_file:
@@ -504,3 +751,45 @@ class VideoProcessor:
             RuntimeError: If ffmpeg fails
         """
         run_ffmpeg_with_progress(cmd, operation, self.config.verbose)
+
+    def _run_ffmpeg_cached(self, cmd: List[str], output_file: Path, inputs: List[Path],
+                           operation: str = "Processing video") -> Path:
+        """
+        Run ffmpeg command, reusing the result of an identical earlier run.
+
+        Results are kept in config.cache_dir, keyed by the command and the
+        size/mtime of its inputs. Without a cache directory this is the same
+        as _run_ffmpeg.
+
+        Args:
+            cmd: Command as list of strings
+            output_file: Output file path used in the command
+            inputs: Input files read by the command
+            operation: Description of the operation
+
+        Returns:
+            Path to the output file (may be a file inside the cache directory)
+
+        Raises:
+            RuntimeError: If ffmpeg fails
+        """
+        cache_dir = self.config.cache_dir
+        if cache_dir is None:
+            self._run_ffmpeg(cmd, operation)
+            return output_file
+
+        cached_file = cache_dir / f"{_ffmpeg_cache_key(cmd, output_file, inputs)}{output_file.suffix}"
+        if cached_file.exists():
+            logger.info(f"{operation}: using cached result")
+            return cached_file
+
+        self._run_ffmpeg(cmd, operation)
+
+        # Move into place only once ffmpeg succeeded so the cache never holds partial files
+        try:
+            shutil.move(str(output_file), str(cached_file))
+        except OSError as e:
+            logger.warning(f"Failed to cache ffmpeg result: {e}")
+            return output_file
+
+        return cached_file
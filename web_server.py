@@ -11,14 +11,20 @@ import queue
 import shutil
 import subprocess
 import threading
+import time
 import uuid
 import re
+import selectors
 import requests
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
-from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, send_file, session, redirect, url_for, stream_with_context
 from flask_cors import CORS
 
 # Add src to path for imports
@@ -30,8 +36,10 @@ try:
     from google.oauth2.credentials import Credentials
     from google_auth_oauthlib.flow import Flow
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload
+    from googleapiclient.http import HttpRequest, MediaIoBaseUpload
     from google.auth.transport.requests import Request
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
     YOUTUBE_AVAILABLE = True
 except ImportError:
     YOUTUBE_AVAILABLE = False
@@ -57,24 +65,117 @@ app.wsgi_app = ProxyFix(
 RUNS_DIR = Path('runs')
 RUNS_DIR.mkdir(exist_ok=True)
 
+# Log lines kept per job until the client fetches them (oldest are dropped)
+JOB_LOG_MAX_LINES = 2000
+
+# Build log markers: "Step N/4" lines map to (current_step, progress)
+_STEP_RE = re.compile(r'Step (\d)/4|Video successfully created|ERROR')
+_STEPS = {
+    '1': ('Processing video clips', 25),
+    '2': ('Mixing audio tracks', 50),
+    '3': ('Rendering quotes', 75),
+    '4': ('Creating final video', 90),
+}
+
+# Bytes read from a job's output pipe per wakeup
+PIPE_READ_SIZE = 65536
+
+# Universal newlines: ffmpeg progress updates are terminated by a bare \r
+_NEWLINE_RE = re.compile(rb'\r\n|\r|\n')
+
+# Buffer size used when copying uploads that aren't backed by a real file
+UPLOAD_COPY_BUFSIZE = 1024 * 1024
+
+# Number of Suno songs downloaded at the same time
+SUNO_DOWNLOAD_WORKERS = 8
+
+# Bytes written to disk per iteration while streaming a Suno song
+SUNO_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Suno playlist URL formats, tried in order
+SUNO_PLAYLIST_PATTERNS = [
+    re.compile(r'/playlists/([a-zA-Z0-9_-]+)'),
+    re.compile(r'/playlist/([a-zA-Z0-9_-]+)'),
+    re.compile(r'\?id=([a-zA-Z0-9_-]+)'),
+    re.compile(r'suno\.com/([a-zA-Z0-9_-]{10,})'),
+]
+SUNO_PLAYLIST_ID_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+# Song title -> filename sanitization
+FILENAME_INVALID_CHARS_RE = re.compile(r'[^\w\s-]')
+FILENAME_SEPARATORS_RE = re.compile(r'[-\s]+')
+
 ALLOWED_EXTENSIONS = {
     'video': {'.mp4', '.mov', '.avi', '.mkv'},
     'audio': {'.mp3', '.wav', '.m4a', '.aac', '.ogg'},
     'quote': {'.txt'}
 }
 
+# Allowed extensions per upload file type, as tuples for str.endswith
+_ALLOWED_EXTS = {
+    'videos': tuple(ALLOWED_EXTENSIONS['video']),
+    'music': tuple(ALLOWED_EXTENSIONS['audio']),
+    'sounds': tuple(ALLOWED_EXTENSIONS['audio']),
+    'quotes': tuple(ALLOWED_EXTENSIONS['quote']),
+}
+
 # Initialize database
 db = Database('data/yt-builder.db')
 
-# Job management
+# Job management: `jobs` is copy-on-write. Writers rebind it to an updated
+# copy under job_lock, so readers can use the current dict without locking.
 jobs = {}
-job_lock = threading.Lock()
+job_lock = threading.RLock()
+
+
+# Background Suno playlist downloads, keyed by (job_id, task_id)
+suno_executor = ThreadPoolExecutor(max_workers=2)
+suno_tasks = {}
+suno_tasks_lock = threading.Lock()
+# How long a finished download's result is kept for a client that hasn't polled it
+SUNO_RESULT_TTL = 300
+
+
+def store_job(job):
+    """Add or replace a job in the in-memory registry"""
+    global jobs
+    with job_lock:
+        updated = dict(jobs)
+        updated[job.job_id] = job
+        jobs = updated
 
 
-def allowed_file(filename, file_type):
-    """Check if file extension is allowed for the given type"""
-    ext = Path(filename).suffix.lower()
-    return ext in ALLOWED_EXTENSIONS.get(file_type, set())
+def discard_job(job_id):
+    """Remove a job from the in-memory registry if present"""
+    global jobs
+    with job_lock:
+        if job_id in jobs:
+            updated = dict(jobs)
+            del updated[job_id]
+            jobs = updated
+
+
+def save_upload(file, filepath):
+    """Write an uploaded file to disk, using sendfile when it is backed by a real file"""
+    src = file.stream
+    with open(filepath, 'wb') as dst:
+        try:
+            src_fd = src.fileno()
+            size = os.fstat(src_fd).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except (AttributeError, OSError):
+            # In-memory stream or no sendfile support: fall back to a buffered copy
+            dst.seek(0)
+            dst.truncate()
+            src.seek(0)
+
+        shutil.copyfileobj(src, dst, UPLOAD_COPY_BUFSIZE)
 
 
 class Job:
@@ -94,7 +195,17 @@ class Job:
         self.started_at = None
         self.finished_at = None
         self.process = None
-        self.log_queue = queue.Queue()
+        self._pipe_buffer = b''
+        self._pipe_closed = threading.Event()
+        self.log_queue = deque(maxlen=JOB_LOG_MAX_LINES)
+        self._log_lock = threading.Lock()
+
+        # File counts are cached until files are added or removed
+        self._file_counts_cache = None
+        self._counts_dirty = True
+
+        # Sorted directory listings per file type, keyed by directory mtime
+        self._listing_cache = {}
 
         # Create run directory structure
         self._create_run_directories()
@@ -108,14 +219,31 @@ class Job:
         self.output_dir = self.run_dir / 'output'
         self.temp_dir = self.run_dir / '.tmp'
 
+        # One scan of the run directory; only missing subdirectories are created
+        try:
+            with os.scandir(self.run_dir) as it:
+                existing = {e.name for e in it if e.is_dir()}
+        except FileNotFoundError:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            existing = set()
+
         for directory in [self.videos_dir, self.music_dir, self.sounds_dir,
                          self.quotes_dir, self.output_dir, self.temp_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+            if directory.name not in existing:
+                directory.mkdir(exist_ok=True)
 
     def get_file_counts(self):
         """Get count of files in each directory"""
-        # Get from database for accuracy
-        return db.get_file_counts(self.job_id)
+        # Get from database for accuracy, but only after files changed
+        if self._counts_dirty or self._file_counts_cache is None:
+            # Clear the flag first so an invalidation during the query is not lost
+            self._counts_dirty = False
+            self._file_counts_cache = db.get_file_counts(self.job_id)
+        return self._file_counts_cache
+
+    def invalidate_file_counts(self):
+        """Mark cached file counts as stale after files were added or removed"""
+        self._counts_dirty = True
 
     def update_status(self, status, **kwargs):
         """Update job status in database"""
@@ -146,8 +274,11 @@ class Job:
             error=self.error
         )
 
-    def to_dict(self):
+    def to_dict(self, file_counts=None):
         """Convert job to dictionary for JSON serialization"""
+        if file_counts is None:
+            file_counts = self.get_file_counts()
+
         return {
             'job_id': self.job_id,
             'run_id': self.run_id,
@@ -156,7 +287,7 @@ class Job:
             'current_step': self.current_step,
             'output_file': self.output_file,
             'error': self.error,
-            'file_counts': self.get_file_counts(),
+            'file_counts': file_counts,
             'created_at': self.created_at.isoformat(),
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'finished_at': self.finished_at.isoformat() if self.finished_at else None,
@@ -206,6 +337,96 @@ def get_job_or_404(job_id):
     return job
 
 
+# One pump thread reads the output pipes of all running jobs
+_pipe_selector = selectors.DefaultSelector()
+_pipe_pump_lock = threading.Lock()
+_pipe_pump_thread = None
+
+
+def _handle_job_line(job, line):
+    """Record a build log line and update job progress from it"""
+    with job._log_lock:
+        job.log_queue.append(line.strip())
+
+    # Update job status based on log lines
+    match = _STEP_RE.search(line)
+    if match:
+        step = match.group(1)
+        try:
+            if step in _STEPS:
+                current_step, progress = _STEPS[step]
+                job.update_status('running', current_step=current_step, progress=progress)
+            elif match.group(0) == 'ERROR':
+                job.error = line
+            elif step is None:
+                job.update_status('running', current_step='Complete', progress=100)
+        except Exception as e:
+            # A failed status write must not stop the job's output from being read
+            print(f"Error saving progress for job {job.job_id}: {e}")
+
+
+def _read_job_pipe(key):
+    """Read available output from a job's pipe and dispatch complete lines"""
+    job = key.data
+    try:
+        chunk = os.read(key.fd, PIPE_READ_SIZE)
+    except BlockingIOError:
+        return
+    except OSError:
+        chunk = b''
+
+    if not chunk:
+        # EOF: flush any trailing partial line and release the pipe
+        _pipe_selector.unregister(key.fileobj)
+        key.fileobj.close()
+        tail = job._pipe_buffer.rstrip(b'\r')
+        if tail:
+            _handle_job_line(job, tail.decode('utf-8', errors='replace'))
+            job._pipe_buffer = b''
+        job._pipe_closed.set()
+        return
+
+    data = job._pipe_buffer + chunk
+    # A trailing \r may be the first half of \r\n: hold it back with the partial line
+    held = b'\r' if data.endswith(b'\r') else b''
+    *lines, partial = _NEWLINE_RE.split(data[:len(data) - len(held)])
+    job._pipe_buffer = partial + held
+    for line in lines:
+        _handle_job_line(job, line.decode('utf-8', errors='replace'))
+
+
+def _pipe_pump():
+    """Multiplex the output pipes of all running jobs"""
+    while True:
+        for key, _ in _pipe_selector.select(timeout=0.5):
+            try:
+                _read_job_pipe(key)
+            except Exception as e:
+                print(f"Error reading output for job {key.data.job_id}: {e}")
+                try:
+                    _pipe_selector.unregister(key.fileobj)
+                except (KeyError, ValueError):
+                    pass
+                # Close our end so the child gets EPIPE instead of blocking on a full pipe
+                key.fileobj.close()
+                key.data._pipe_closed.set()
+
+
+def _watch_job_output(job):
+    """Register a job's stdout pipe with the shared pump thread"""
+    global _pipe_pump_thread
+    stdout = job.process.stdout
+    os.set_blocking(stdout.fileno(), False)
+    job._pipe_buffer = b''
+    job._pipe_closed.clear()
+    _pipe_selector.register(stdout, selectors.EVENT_READ, data=job)
+
+    with _pipe_pump_lock:
+        if _pipe_pump_thread is None:
+            _pipe_pump_thread = threading.Thread(target=_pipe_pump, daemon=True)
+            _pipe_pump_thread.start()
+
+
 def run_job(job):
     """Run a video build job in background"""
     job.update_status('running')
@@ -253,35 +474,16 @@ def run_job(job):
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
             env=env,
             cwd=os.getcwd()
         )
 
-        # Read output and update progress
-        for line in iter(job.process.stdout.readline, ''):
-            if not line:
-                break
-
-            # Parse progress from line
-            job.log_queue.put(line.strip())
-
-            # Update job status based on log lines
-            if 'Step 1/4' in line:
-                job.update_status('running', current_step='Processing video clips', progress=25)
-            elif 'Step 2/4' in line:
-                job.update_status('running', current_step='Mixing audio tracks', progress=50)
-            elif 'Step 3/4' in line:
-                job.update_status('running', current_step='Rendering quotes', progress=75)
-            elif 'Step 4/4' in line:
-                job.update_status('running', current_step='Creating final video', progress=90)
-            elif 'Video successfully created' in line:
-                job.update_status('running', current_step='Complete', progress=100)
-            elif 'ERROR' in line:
-                job.error = line
+        # Output is read and parsed by the shared pump thread
+        _watch_job_output(job)
 
         return_code = job.process.wait()
+        # Make sure the final log lines are parsed before reporting the result
+        job._pipe_closed.wait()
 
         if return_code == 0:
             job.update_status('completed', output_file=str(output_path), progress=100)
@@ -326,23 +528,48 @@ def get_defaults():
     })
 
 
+# Sorted media listings keyed by (directory, extensions) -> (mtime_ns, files)
+_LISTING_CACHE = {}
+
+
+def get_media_files(directory, extensions):
+    """List media files in a directory, reusing the cached listing while its mtime is unchanged"""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return []
+
+    key = (directory, tuple(extensions))
+    cached = _LISTING_CACHE.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    # One directory pass for all extensions; DirEntry.is_file() uses the cached
+    # d_type and only stats symlinks, which are followed as Path.glob did
+    ext_set = {e.lower() for e in extensions}
+    try:
+        with os.scandir(directory) as it:
+            files = sorted(
+                e.name for e in it
+                if not e.name.startswith('.')
+                and e.is_file()
+                and os.path.splitext(e.name)[1].lower() in ext_set
+            )
+    except FileNotFoundError:
+        return []
+
+    _LISTING_CACHE[key] = (mtime, files)
+    return files
+
+
 @app.route('/api/files')
 def list_files():
     """List available media files"""
-    def get_files(directory, extensions):
-        path = Path(directory)
-        if not path.exists():
-            return []
-        files = []
-        for ext in extensions:
-            files.extend([f.name for f in path.glob(f'*{ext}')])
-        return sorted(files)
-
     return jsonify({
-        'videos': get_files('videos', ['.mp4', '.mov', '.avi', '.mkv']),
-        'music': get_files('music', ['.mp3', '.wav', '.m4a', '.aac', '.ogg']),
-        'sounds': get_files('sounds', ['.mp3', '.wav', '.m4a', '.aac', '.ogg']),
-        'quotes': get_files('quotes', ['.txt'])
+        'videos': get_media_files('videos', ['.mp4', '.mov', '.avi', '.mkv']),
+        'music': get_media_files('music', ['.mp3', '.wav', '.m4a', '.aac', '.ogg']),
+        'sounds': get_media_files('sounds', ['.mp3', '.wav', '.m4a', '.aac', '.ogg']),
+        'quotes': get_media_files('quotes', ['.txt'])
     })
 
 
@@ -361,32 +588,37 @@ def upload_files(job_id, file_type):
 
     files = request.files.getlist('files')
     uploaded_files = []
+    file_rows = []
     errors = []
 
-    # Determine target directory and allowed type
-    target_dir = getattr(job, f'{file_type}_dir')
-    allowed_type = 'video' if file_type == 'videos' else \
-                   'audio' if file_type in ['music', 'sounds'] else 'quote'
+    # Determine target directory and allowed extensions once for the batch
+    target_dir = str(getattr(job, f'{file_type}_dir'))
+    allowed_exts = _ALLOWED_EXTS[file_type]
 
     for file in files:
         if file.filename == '':
             continue
 
-        if not allowed_file(file.filename, allowed_type):
+        if not file.filename.lower().endswith(allowed_exts):
             errors.append(f'{file.filename}: Invalid file type')
             continue
 
         try:
             filename = secure_filename(file.filename)
-            filepath = target_dir / filename
-            file.save(str(filepath))
+            filepath = os.path.join(target_dir, filename)
+            save_upload(file, filepath)
             uploaded_files.append(filename)
-
-            # Track in database
-            db.add_file(job_id, file_type, filename, str(filepath))
+            file_rows.append((filename, filepath))
         except Exception as e:
             errors.append(f'{file.filename}: {str(e)}')
 
+    # Track all saved files in database in one transaction
+    try:
+        db.add_files_bulk(job_id, file_type, file_rows)
+    except Exception as e:
+        errors.append(f'Failed to record uploaded files: {str(e)}')
+    job.invalidate_file_counts()
+
     return jsonify({
         'uploaded': uploaded_files,
         'errors': errors,
@@ -405,9 +637,25 @@ def list_job_files(job_id, file_type):
         return jsonify({'error': 'Invalid file type'}), 400
 
     directory = getattr(job, f'{file_type}_dir')
-    files = [f.name for f in directory.glob('*.*') if f.is_file()]
 
-    return jsonify({'files': sorted(files)})
+    # Adding or removing files bumps the directory mtime, invalidating the cache
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+        cached = job._listing_cache.get(file_type)
+        if cached and cached[0] == mtime:
+            files = cached[1]
+        else:
+            with os.scandir(directory) as it:
+                files = sorted(
+                    e.name for e in it
+                    if not e.name.startswith('.') and '.' in e.name and e.is_file()
+                )
+            job._listing_cache[file_type] = (mtime, files)
+    except FileNotFoundError:
+        job._listing_cache.pop(file_type, None)
+        return jsonify({'files': []})
+
+    return jsonify({'files': files})
 
 
 @app.route('/api/jobs/<int:job_id>/files/<file_type>/<filename>', methods=['DELETE'])
@@ -431,6 +679,7 @@ def delete_job_file(job_id, file_type, filename):
 
         # Delete from database
         db.delete_file(job_id, file_type, filename)
+        job.invalidate_file_counts()
 
         return jsonify({
             'message': 'File deleted',
@@ -443,44 +692,111 @@ def delete_job_file(job_id, file_type, filename):
 def extract_playlist_id(url: str) -> str:
     """Extract playlist ID from various Suno URL formats"""
     # Try different URL patterns
-    patterns = [
-        r'/playlists/([a-zA-Z0-9_-]+)',
-        r'/playlist/([a-zA-Z0-9_-]+)',
-        r'\?id=([a-zA-Z0-9_-]+)',
-        r'suno\.com/([a-zA-Z0-9_-]{10,})'
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in SUNO_PLAYLIST_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
 
     # If no pattern matches, check if the URL itself might be the ID
     cleaned = url.strip().split('/')[-1].split('?')[0]
-    if len(cleaned) >= 10 and re.match(r'^[a-zA-Z0-9_-]+$', cleaned):
+    if len(cleaned) >= 10 and SUNO_PLAYLIST_ID_RE.match(cleaned):
         return cleaned
 
     return None
 
 
+def _create_suno_session() -> requests.Session:
+    """Create the shared HTTP session used for all Suno API calls and downloads"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Referer': 'https://suno.com/'
+    })
+
+    # Retry transient gateway errors; the final response is still checked with raise_for_status
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Keep-alive connections (and TLS sessions) are reused across all Suno requests
+_SUNO_SESSION = _create_suno_session()
+
+
 def fetch_suno_playlist_page(playlist_id: str, page: int = 0) -> dict:
     """Fetch a single page of a Suno playlist"""
     api_url = f'https://studio-api.prod.suno.com/api/playlist/{playlist_id}/'
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json',
-        'Referer': 'https://suno.com/'
-    }
-
     params = {'page': page} if page > 0 else {}
 
-    response = requests.get(api_url, headers=headers, params=params, timeout=30)
+    response = _SUNO_SESSION.get(api_url, headers={'Accept': 'application/json'}, params=params, timeout=30)
     response.raise_for_status()
 
     return response.json()
 
 
+def _download_suno_clip(idx: int, total: int, clip: dict, output_dir: Path):
+    """
+    Download a single Suno clip.
+    Returns (filename, None) on success or (None, error message) on failure.
+    """
+    try:
+        # Get clip metadata from the nested structure
+        clip_data = clip.get('clip', {})
+
+        song_title = clip_data.get('title', '').strip()
+        song_id = clip_data.get('id', '')
+        audio_url = clip_data.get('audio_url')
+
+        # Skip if no audio URL (already filtered, but double-check)
+        if not audio_url:
+            return None, f'Clip {idx + 1}: No audio URL found'
+
+        # Sanitize filename
+        if song_title:
+            safe_title = FILENAME_INVALID_CHARS_RE.sub('', song_title)
+            safe_title = FILENAME_SEPARATORS_RE.sub('-', safe_title).strip('-')
+        else:
+            safe_title = ''
+
+        # Use fallback name if no title or sanitization resulted in empty string
+        if not safe_title:
+            safe_title = f'Untitled-Song-{idx + 1}'
+            display_title = f'Untitled Song {idx + 1}'
+        else:
+            display_title = song_title
+
+        filename = f'{safe_title}_{song_id[:8]}.mp3' if song_id else f'{safe_title}.mp3'
+
+        print(f"[Suno] Downloading {idx + 1}/{total}: {display_title}")
+
+        # Download the song (closing the response returns its connection to the pool)
+        filepath = output_dir / filename
+
+        with _SUNO_SESSION.get(audio_url, timeout=120, stream=True) as song_response:
+            song_response.raise_for_status()
+
+            with open(filepath, 'wb') as f:
+                for chunk in song_response.iter_content(chunk_size=SUNO_DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+
+        print(f"[Suno] ✓ Downloaded: {filename}")
+        return filename, None
+
+    except requests.HTTPError as e:
+        song_title = clip.get('clip', {}).get('title', f'Unknown')
+        error_msg = f'{song_title}: Download failed (HTTP {e.response.status_code})'
+        print(f"[Suno] ✗ {error_msg}")
+        return None, error_msg
+    except Exception as e:
+        song_title = clip.get('clip', {}).get('title', f'Unknown')
+        error_msg = f'{song_title}: {str(e)}'
+        print(f"[Suno] ✗ {error_msg}")
+        return None, error_msg
+
+
 def download_suno_playlist(playlist_url: str, output_dir: Path) -> dict:
     """
     Download songs from a Suno playlist.
@@ -549,75 +865,24 @@ def download_suno_playlist(playlist_url: str, output_dir: Path) -> dict:
                 'errors': ['No songs found in playlist or all clips are invalid']
             }
 
-        # Download each song
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Referer': 'https://suno.com/'
-        }
-
         print(f"[Suno] Found {len(all_clips)} unique clips to download")
 
-        for idx, clip in enumerate(all_clips):
-            try:
-                # Get clip metadata from the nested structure
-                clip_data = clip.get('clip', {})
-
-                song_title = clip_data.get('title', '').strip()
-                song_id = clip_data.get('id', '')
-                audio_url = clip_data.get('audio_url')
-
-                # Skip if no audio URL (already filtered, but double-check)
-                if not audio_url:
-                    errors.append(f'Clip {idx + 1}: No audio URL found')
-                    continue
-
-                # Sanitize filename
-                if song_title:
-                    safe_title = re.sub(r'[^\w\s-]', '', song_title)
-                    safe_title = re.sub(r'[-\s]+', '-', safe_title).strip('-')
-                else:
-                    safe_title = ''
-
-                # Use fallback name if no title or sanitization resulted in empty string
-                if not safe_title:
-                    safe_title = f'Untitled-Song-{idx + 1}'
-                    display_title = f'Untitled Song {idx + 1}'
-                else:
-                    display_title = song_title
-
-                filename = f'{safe_title}_{song_id[:8]}.mp3' if song_id else f'{safe_title}.mp3'
-
-                print(f"[Suno] Downloading {idx + 1}/{len(all_clips)}: {display_title}")
-
-                # Download the song
-                song_response = requests.get(audio_url, headers=headers, timeout=120, stream=True)
-                song_response.raise_for_status()
-
-                filepath = output_dir / filename
-
-                with open(filepath, 'wb') as f:
-                    for chunk in song_response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+        # Download songs concurrently, keeping results in playlist order
+        results = {}
+        with ThreadPoolExecutor(max_workers=SUNO_DOWNLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(_download_suno_clip, idx, len(all_clips), clip, output_dir): idx
+                for idx, clip in enumerate(all_clips)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
 
+        for idx in sorted(results):
+            filename, error = results[idx]
+            if filename:
                 downloaded.append(filename)
-                print(f"[Suno] ✓ Downloaded: {filename}")
-
-                # Track in database if job_id is available (will be passed from endpoint)
-                if hasattr(output_dir, 'parent') and 'runs' in str(output_dir):
-                    # Extract job_id from path if possible - will be set by endpoint
-                    pass
-
-            except requests.HTTPError as e:
-                song_title = clip.get('clip', {}).get('title', f'Unknown')
-                error_msg = f'{song_title}: Download failed (HTTP {e.response.status_code})'
-                errors.append(error_msg)
-                print(f"[Suno] ✗ {error_msg}")
-            except Exception as e:
-                song_title = clip.get('clip', {}).get('title', f'Unknown')
-                error_msg = f'{song_title}: {str(e)}'
-                errors.append(error_msg)
-                print(f"[Suno] ✗ {error_msg}")
+            else:
+                errors.append(error)
 
     except requests.Timeout:
         errors.append('Request timeout - playlist may be too large or server is slow')
@@ -648,20 +913,62 @@ def download_suno_playlist_endpoint(job_id):
     if 'suno' not in playlist_url.lower():
         return jsonify({'error': 'URL must be a Suno playlist'}), 400
 
-    # Download songs in background to avoid timeout
-    # For now, we'll do it synchronously but this could be threaded
+    # Download songs in background to avoid timeout; the client polls for the result
+    task_id = uuid.uuid4().hex[:8]
+    future = suno_executor.submit(run_suno_download, job, playlist_url)
+    with suno_tasks_lock:
+        suno_tasks[(job_id, task_id)] = future
+    future.add_done_callback(lambda f: _schedule_suno_task_expiry((job_id, task_id)))
+
+    return jsonify({'task_id': task_id, 'status': 'running'}), 202
+
+
+def _schedule_suno_task_expiry(key):
+    """Drop a finished Suno task after SUNO_RESULT_TTL if no client collected it"""
+    def expire():
+        with suno_tasks_lock:
+            suno_tasks.pop(key, None)
+
+    timer = threading.Timer(SUNO_RESULT_TTL, expire)
+    timer.daemon = True
+    timer.start()
+
+
+@app.route('/api/jobs/<int:job_id>/playlist/suno/<task_id>')
+def get_suno_download_status(job_id, task_id):
+    """Get the status of a background Suno playlist download"""
+    with suno_tasks_lock:
+        future = suno_tasks.get((job_id, task_id))
+        if future is None:
+            return jsonify({'error': 'Download task not found'}), 404
+        if not future.done():
+            return jsonify({'task_id': task_id, 'status': 'running'})
+        del suno_tasks[(job_id, task_id)]
+
+    try:
+        result = future.result()
+    except Exception as e:
+        return jsonify({'task_id': task_id, 'status': 'failed', 'error': str(e)}), 500
+
+    return jsonify({'task_id': task_id, 'status': 'completed', **result})
+
+
+def run_suno_download(job, playlist_url):
+    """Download a Suno playlist into a job's music folder and track the files"""
     result = download_suno_playlist(playlist_url, job.music_dir)
 
     # Track downloaded files in database
-    for filename in result['downloaded']:
-        filepath = job.music_dir / filename
-        db.add_file(job_id, 'music', filename, str(filepath))
+    db.add_files_bulk(job.job_id, 'music', [
+        (filename, str(job.music_dir / filename))
+        for filename in result['downloaded']
+    ])
+    job.invalidate_file_counts()
 
-    return jsonify({
+    return {
         'downloaded': result['downloaded'],
         'errors': result['errors'],
         'file_counts': job.get_file_counts()
-    })
+    }
 
 
 @app.route('/api/jobs/prepare', methods=['POST'])
@@ -704,7 +1011,7 @@ def prepare_job():
         # Create job object
         job = Job(job_id, default_config, run_dir, run_identifier)
         job.status = 'preparing'  # Special status for file upload phase
-        jobs[job_id] = job
+        store_job(job)
 
         # Update status in database
         db.update_job_status(job_id, 'preparing')
@@ -759,7 +1066,7 @@ def create_job():
 
         # Create job object
         job = Job(job_id, config, run_dir, run_identifier)
-        jobs[job_id] = job
+        store_job(job)
 
         # Start job in background thread (non-daemon so it completes even if server shuts down)
         thread = threading.Thread(target=run_job, args=(job,), daemon=False)
@@ -785,12 +1092,9 @@ def get_job_logs(job_id):
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
-    logs = []
-    while not job.log_queue.empty():
-        try:
-            logs.append(job.log_queue.get_nowait())
-        except queue.Empty:
-            break
+    with job._log_lock:
+        logs = list(job.log_queue)
+        job.log_queue.clear()
 
     return jsonify({'logs': logs})
 
@@ -812,20 +1116,20 @@ def cancel_job(job_id):
 @app.route('/api/jobs')
 def list_jobs():
     """List all jobs"""
-    # Get jobs from database
-    db_jobs = db.get_all_jobs()
+    # Get jobs together with their file counts in a single query
+    db_jobs = db.get_all_jobs_with_counts()
+
+    # Snapshot the in-memory registry once for this request
+    live_jobs = jobs
 
     # Return jobs (mix of in-memory and database)
     all_jobs = []
-
-    # First add in-memory jobs (current session)
-    for job in jobs.values():
-        all_jobs.append(job.to_dict())
+    db_counts = {}
 
     # Add database jobs that aren't in memory
-    in_memory_ids = {job.job_id for job in jobs.values()}
     for db_job in db_jobs:
-        if db_job['job_id'] not in in_memory_ids:
+        db_counts[db_job['job_id']] = db_job['file_counts']
+        if db_job['job_id'] not in live_jobs:
             # Create a minimal dict from database data
             all_jobs.append({
                 'job_id': db_job['job_id'],
@@ -835,12 +1139,16 @@ def list_jobs():
                 'current_step': db_job['current_step'] or '',
                 'output_file': db_job['output_file'],
                 'error': db_job['error'],
-                'file_counts': db.get_file_counts(db_job['job_id']),
+                'file_counts': db_job['file_counts'],
                 'created_at': db_job['created_at'],
                 'started_at': db_job['started_at'],
                 'finished_at': db_job['finished_at']
             })
 
+    # In-memory jobs (current session) carry the live status
+    for job in live_jobs.values():
+        all_jobs.append(job.to_dict(file_counts=db_counts.get(job.job_id)))
+
     # Sort by created_at descending
     all_jobs.sort(key=lambda x: x['created_at'], reverse=True)
 
@@ -857,7 +1165,9 @@ def download_job(job_id):
     if not job.output_file or not Path(job.output_file).exists():
         return jsonify({'error': 'Output file not found'}), 404
 
-    return send_file(job.output_file, as_attachment=True)
+    # Conditional/range responses let browsers resume large downloads; the file
+    # body goes through wsgi.file_wrapper (sendfile) on servers that provide it
+    return send_file(job.output_file, as_attachment=True, conditional=True, etag=True, max_age=0)
 
 
 # YouTube Upload Functionality
@@ -865,9 +1175,63 @@ YOUTUBE_SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 YOUTUBE_API_SERVICE_NAME = 'youtube'
 YOUTUBE_API_VERSION = 'v3'
 
+# Resumable upload chunk size; the API requires a multiple of 256 KiB
+YOUTUBE_CHUNK_ALIGNMENT = 256 * 1024
+
+
+def _youtube_upload_chunk_size():
+    """Read the upload chunk size from the environment, rounded up to the API granularity"""
+    default = 8 * 1024 * 1024
+    value = os.environ.get('YT_BUILDER_UPLOAD_CHUNK_SIZE')
+    if value is None:
+        return default
+
+    try:
+        requested = int(value)
+    except ValueError:
+        requested = 0
+    if requested <= 0:
+        print(f"Warning: invalid YT_BUILDER_UPLOAD_CHUNK_SIZE {value!r}, using {default} bytes")
+        return default
+
+    units = max(-(-requested // YOUTUBE_CHUNK_ALIGNMENT), 1)
+    return units * YOUTUBE_CHUNK_ALIGNMENT
+
+
+YOUTUBE_UPLOAD_CHUNK_SIZE = _youtube_upload_chunk_size()
+
+# Retries per upload chunk on transient errors (5xx, 429, dropped connections),
+# with randomized exponential backoff; the chunk is resumed, not the whole upload
+YOUTUBE_UPLOAD_RETRIES = 6
+
+# Upload progress is logged by one thread at this interval instead of on every chunk
+UPLOAD_PROGRESS_LOG_INTERVAL = 0.5
+
+# Background YouTube uploads: upload_id -> queue of progress events
+YOUTUBE_UPLOAD_WORKERS = 4
+youtube_upload_executor = ThreadPoolExecutor(max_workers=YOUTUBE_UPLOAD_WORKERS)
+upload_jobs = {}
+# Latest percentage per running upload: upload_id -> progress
+upload_progress = {}
+
+# Progress stream: heartbeat interval, and how long to wait without events before closing
+UPLOAD_HEARTBEAT_INTERVAL = 15
+UPLOAD_PROGRESS_TIMEOUT = 120
+# How long a finished upload's events are kept for a client that hasn't read them
+UPLOAD_RESULT_TTL = 300
+
 # Store for YouTube credentials (in production, use a proper database)
 youtube_credentials = {}
 
+# Built YouTube API clients per user: user_id -> (expires_at, service)
+_youtube_service_cache = {}
+_youtube_service_lock = threading.Lock()
+
+# Seconds before token expiry at which a cached client is rebuilt (and the token refreshed)
+YOUTUBE_SERVICE_EXPIRY_MARGIN = 60
+# Lifetime of a cached client when the token has no known expiry
+YOUTUBE_SERVICE_DEFAULT_TTL = 300
+
 
 def get_redirect_uri():
     """Get the correct redirect URI, handling HTTPS behind proxy"""
@@ -915,6 +1279,7 @@ def save_youtube_credentials(user_id: str, credentials):
         db.save_youtube_credentials(user_id, credentials_json)
         # Also keep in memory for quick access
         youtube_credentials[user_id] = credentials
+        forget_youtube_service(user_id)
         print(f"Saved YouTube credentials for user {user_id} (has_refresh_token={bool(credentials.refresh_token)})")
     except Exception as e:
         print(f"Warning: Failed to save YouTube credentials: {e}")
@@ -964,17 +1329,46 @@ def load_youtube_credentials(user_id: str = 'default'):
     return None
 
 
+def forget_youtube_service(user_id):
+    """Drop the cached YouTube client for a user"""
+    with _youtube_service_lock:
+        _youtube_service_cache.pop(user_id, None)
+
+
 def get_youtube_service(user_id='default'):
-    """Get authenticated YouTube service"""
+    """Get authenticated YouTube service, reusing the cached client until its token expires"""
     if not YOUTUBE_AVAILABLE:
         return None
 
+    with _youtube_service_lock:
+        cached = _youtube_service_cache.get(user_id)
+        if cached and cached[0] > time.time():
+            return cached[1]
+
+    service, creds = _build_youtube_service(user_id)
+    if service is not None:
+        if creds.expiry:
+            # google-auth stores expiry as a naive UTC datetime
+            expires_at = creds.expiry.replace(tzinfo=timezone.utc).timestamp() - YOUTUBE_SERVICE_EXPIRY_MARGIN
+        else:
+            expires_at = time.time() + YOUTUBE_SERVICE_DEFAULT_TTL
+        with _youtube_service_lock:
+            _youtube_service_cache[user_id] = (expires_at, service)
+
+    return service
+
+
+def _build_youtube_service(user_id):
+    """
+    Load (and refresh if needed) a user's credentials and build a YouTube client.
+    Returns (service, credentials), or (None, None) if not authenticated.
+    """
     creds = youtube_credentials.get(user_id)
     if not creds:
         # Try loading from database
         creds = load_youtube_credentials(user_id)
         if not creds:
-            return None
+            return None, None
 
     # Check if credentials need refresh
     if creds.expired:
@@ -984,7 +1378,7 @@ def get_youtube_service(user_id='default'):
             # Delete invalid credentials
             db.delete_youtube_credentials(user_id)
             youtube_credentials.pop(user_id, None)
-            return None
+            return None, None
         
         if Request is not None:
             try:
@@ -997,12 +1391,19 @@ def get_youtube_service(user_id='default'):
                 # Delete invalid credentials
                 db.delete_youtube_credentials(user_id)
                 youtube_credentials.pop(user_id, None)
-                return None
+                return None, None
         else:
             print(f"Error: Request object not available for token refresh")
-            return None
+            return None, None
+
+    def build_request(http, *args, **kwargs):
+        # The client may be shared by concurrent uploads, and httplib2
+        # connections are not thread-safe: give every request its own
+        return HttpRequest(AuthorizedHttp(creds, http=httplib2.Http()), *args, **kwargs)
 
-    return build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, credentials=creds)
+    service = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION,
+                    credentials=creds, requestBuilder=build_request)
+    return service, creds
 
 
 @app.route('/api/youtube/auth/status')
@@ -1162,6 +1563,7 @@ def youtube_auth_revoke():
         # Delete credentials from database and memory
         db.delete_youtube_credentials(user_id)
         youtube_credentials.pop(user_id, None)
+        forget_youtube_service(user_id)
         
         return jsonify({
             'success': True,
@@ -1208,31 +1610,95 @@ def upload_to_youtube(job_id):
         }), 401
 
     data = request.get_json()
-    title = data.get('title', 'Video created with YT Builder')
-    description = data.get('description', '')
-    privacy = data.get('privacy', 'private')
-    tags = data.get('tags', [])
-    category = data.get('category', '22')  # Default to People & Blogs
+    metadata = {
+        'title': data.get('title', 'Video created with YT Builder'),
+        'description': data.get('description', ''),
+        'privacy': data.get('privacy', 'private'),
+        'tags': data.get('tags', []),
+        'category': data.get('category', '22')  # Default to People & Blogs
+    }
 
+    # Upload in the background; progress is streamed from /api/uploads/<upload_id>/progress
+    upload_id = uuid.uuid4().hex
+    events = queue.Queue()
+    upload_jobs[upload_id] = events
+    upload_progress[upload_id] = 0
+    _start_upload_progress_logger()
+    youtube_upload_executor.submit(
+        run_youtube_upload, upload_id, events, youtube, job_id, job.output_file, metadata
+    )
+
+    return jsonify({'upload_id': upload_id, 'status': 'uploading'}), 202
+
+
+_upload_progress_logger_lock = threading.Lock()
+_upload_progress_logger_thread = None
+# Last percentage printed per upload, guarded by _upload_progress_log_lock
+_upload_progress_logged = {}
+_upload_progress_log_lock = threading.Lock()
+
+
+def _upload_progress_logger():
+    """Print the progress of running uploads that changed since the last pass"""
+    global _upload_progress_logged
+    while True:
+        time.sleep(UPLOAD_PROGRESS_LOG_INTERVAL)
+        with _upload_progress_log_lock:
+            current = dict(upload_progress)
+            lines = [
+                f"[YouTube] Upload {upload_id[:8]} {progress}% complete"
+                for upload_id, progress in current.items()
+                if _upload_progress_logged.get(upload_id) != progress
+            ]
+            if lines:
+                print('\n'.join(lines))
+            _upload_progress_logged = current
+
+
+def _finish_upload_progress(upload_id):
+    """Stop tracking an upload, printing its final percentage if the logger hasn't yet"""
+    with _upload_progress_log_lock:
+        progress = upload_progress.pop(upload_id, None)
+        if progress is not None and _upload_progress_logged.pop(upload_id, None) != progress:
+            print(f"[YouTube] Upload {upload_id[:8]} {progress}% complete")
+
+
+def _start_upload_progress_logger():
+    """Start the upload progress logger thread on first use"""
+    global _upload_progress_logger_thread
+    with _upload_progress_logger_lock:
+        if _upload_progress_logger_thread is None:
+            _upload_progress_logger_thread = threading.Thread(target=_upload_progress_logger, daemon=True)
+            _upload_progress_logger_thread.start()
+
+
+def run_youtube_upload(upload_id, events, youtube, job_id, output_file, metadata):
+    """Upload a video to YouTube, reporting progress and the result on the events queue"""
+    fh = None
     try:
         body = {
             'snippet': {
-                'title': title,
-                'description': description,
-                'tags': tags,
-                'categoryId': category
+                'title': metadata['title'],
+                'description': metadata['description'],
+                'tags': metadata['tags'],
+                'categoryId': metadata['category']
             },
             'status': {
-                'privacyStatus': privacy,
+                'privacyStatus': metadata['privacy'],
                 'selfDeclaredMadeForKids': False
             }
         }
 
-        media = MediaFileUpload(
-            job.output_file,
-            chunksize=-1,
-            resumable=True,
-            mimetype='video/mp4'
+        # Bounded chunks keep memory flat and only the failed chunk is resent on error
+        fh = open(output_file, 'rb')
+        if hasattr(os, 'posix_fadvise'):
+            # The file is read once front to back: let the kernel read ahead aggressively
+            os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        media = MediaIoBaseUpload(
+            fh,
+            mimetype='video/mp4',
+            chunksize=YOUTUBE_UPLOAD_CHUNK_SIZE,
+            resumable=True
         )
 
         request_obj = youtube.videos().insert(
@@ -1243,10 +1709,13 @@ def upload_to_youtube(job_id):
 
         response = None
         while response is None:
-            status, response = request_obj.next_chunk()
+            status, response = request_obj.next_chunk(num_retries=YOUTUBE_UPLOAD_RETRIES)
             if status:
-                print(f"[YouTube] Upload {int(status.progress() * 100)}% complete")
+                progress = int(status.progress() * 100)
+                upload_progress[upload_id] = progress
+                events.put({'type': 'progress', 'progress': progress})
 
+        upload_progress[upload_id] = 100
         video_id = response['id']
         video_url = f"https://www.youtube.com/watch?v={video_id}"
 
@@ -1255,22 +1724,58 @@ def upload_to_youtube(job_id):
             job_id=job_id,
             video_id=video_id,
             video_url=video_url,
-            title=title,
-            description=description,
-            privacy=privacy,
-            tags=tags,
-            category=category
+            **metadata
         )
 
-        return jsonify({
+        events.put({
+            'type': 'done',
             'success': True,
             'video_id': video_id,
             'video_url': video_url,
-            'message': f'Video uploaded successfully!'
+            'message': 'Video uploaded successfully!'
         })
 
     except Exception as e:
-        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+        events.put({'type': 'error', 'error': f'Upload failed: {str(e)}'})
+    finally:
+        _finish_upload_progress(upload_id)
+        if fh is not None:
+            fh.close()
+        # Drop the events queue if no client ever streams the result
+        expire = threading.Timer(UPLOAD_RESULT_TTL, upload_jobs.pop, args=(upload_id, None))
+        expire.daemon = True
+        expire.start()
+
+
+@app.route('/api/uploads/<upload_id>/progress')
+def youtube_upload_progress(upload_id):
+    """Stream YouTube upload progress as Server-Sent Events"""
+    events = upload_jobs.get(upload_id)
+    if events is None:
+        return jsonify({'error': 'Upload not found'}), 404
+
+    def generate():
+        idle = 0
+        while idle < UPLOAD_PROGRESS_TIMEOUT:
+            try:
+                event = events.get(timeout=UPLOAD_HEARTBEAT_INTERVAL)
+            except queue.Empty:
+                # Comment line keeps proxies from closing an idle connection
+                idle += UPLOAD_HEARTBEAT_INTERVAL
+                yield ': heartbeat\n\n'
+                continue
+
+            idle = 0
+            yield f'data: {json.dumps(event)}\n\n'
+            if event['type'] != 'progress':
+                upload_jobs.pop(upload_id, None)
+                return
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 def cleanup_old_preparing_jobs(hours: int = 1):
@@ -1295,8 +1800,7 @@ def cleanup_old_preparing_jobs(hours: int = 1):
                     print(f"  Warning: Failed to delete folder {run_dir}: {e}")
             
             # Remove from in-memory jobs if present
-            if job_id in jobs:
-                del jobs[job_id]
+            discard_job(job_id)
             
             # Delete from database
             db.delete_job(job_id)
@@ -1333,17 +1837,16 @@ def load_jobs_from_database():
     if cleaned > 0:
         print(f"Cleaned up {cleaned} old preparing job(s)")
 
-    db_jobs = db.get_all_jobs(limit=50)  # Load recent jobs
-
-    for job_data in db_jobs:
-        # Only load non-completed jobs into memory for potential resumption
-        if job_data['status'] in ['preparing', 'queued']:
-            try:
-                job = Job.from_db(job_data)
-                jobs[job.job_id] = job
-                print(f"  Loaded job #{job.job_id} ({job.status})")
-            except Exception as e:
-                print(f"  Failed to load job #{job_data['job_id']}: {e}")
+    # Only non-completed jobs are loaded into memory for potential resumption
+    for job_data in db.iter_active_jobs(limit=50):
+        if job_data['job_id'] in jobs:
+            continue
+        try:
+            job = Job.from_db(job_data)
+            store_job(job)
+            print(f"  Loaded job #{job.job_id} ({job.status})")
+        except Exception as e:
+            print(f"  Failed to load job #{job_data['job_id']}: {e}")
 
     print(f"Loaded {len(jobs)} active jobs from database")
 
@@ -1368,4 +1871,5 @@ if __name__ == '__main__':
     print(f"Press Ctrl+C to stop")
     print(f"")
 
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    # Each request gets its own thread, so slow handlers never block status polling
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
@@ -4,19 +4,88 @@ YouTube Video Builder - Create looping videos with music, sounds, and quotes
 """
 
 import argparse
+import functools
 import os
 import sys
 import logging
+import re
 from pathlib import Path
 from typing import Tuple, Any
 
 from src.validator import validate_inputs
-from src.video_processor import VideoProcessor
-from src.audio_mixer import AudioMixer
-from src.quote_renderer import QuoteRenderer
 from src.config import Config
 from src.utils import setup_logging, check_disk_space, estimate_output_size
 
+# Resolution strings such as "1920x1080" (case-insensitive 'x', optional spaces)
+_RES_RE = re.compile(r'^\s*(\d+)\s*x\s*(\d+)\s*$')
+
+# Environment variable prefix and accepted spellings of a true boolean
+ENV_PREFIX = 'YT_BUILDER_'
+_TRUTHY = frozenset(('true', '1', 'yes', 'on'))
+
+# Allowed values for enumerated options, in display order
+TRANSITIONS = ('none', 'fade', 'crossfade')
+QUOTE_STYLES = ('minimal', 'centered', 'bottom', 'top')
+
+
+def _choice_type(choices: Tuple[str, ...]):
+    """
+    Build an argparse type callable that accepts only the given choices.
+
+    Args:
+        choices: Allowed values
+
+    Returns:
+        Callable that returns the value or raises ArgumentTypeError
+    """
+    allowed = frozenset(choices)
+
+    def check(value: str) -> str:
+        if value not in allowed:
+            raise argparse.ArgumentTypeError(
+                f"invalid choice: {value!r} (choose from {', '.join(choices)})"
+            )
+        return value
+
+    return check
+
+
+# Arguments that fall back to the environment, then to a built-in default,
+# when not given on the command line: (name, value type, default)
+ENV_ARGUMENTS = (
+    ('duration', float, None),
+    ('quotes-duration', float, 5.0),
+    ('quotes-min-between', float, 10.0),
+    ('quotes-max-between', float, 30.0),
+    ('music-shuffle', bool, False),
+    ('quotes-shuffle', bool, False),
+    ('output', str, 'output.mp4'),
+    ('fps', int, 30),
+    ('resolution', str, '1920x1080'),
+    ('transition', _choice_type(TRANSITIONS), 'crossfade'),
+    ('music-volume', float, 0.7),
+    ('sounds-volume', float, 0.5),
+    ('quote-style', _choice_type(QUOTE_STYLES), 'centered'),
+    ('quote-font', str, 'TenPounds'),
+    ('verbose', bool, False),
+    ('dry-run', bool, False),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _env_snapshot() -> dict:
+    """
+    Capture YT_BUILDER_* variables on first use, keyed by argument name.
+
+    Returns:
+        Dict such as {'music-shuffle': 'true'} for YT_BUILDER_MUSIC_SHUFFLE=true
+    """
+    return {
+        key[len(ENV_PREFIX):].lower().replace('_', '-'): value
+        for key, value in os.environ.items()
+        if key.startswith(ENV_PREFIX)
+    }
+
 
 def get_env_value(key: str, value_type: type = str) -> Any:
     """
@@ -29,21 +98,18 @@ def get_env_value(key: str, value_type: type = str) -> Any:
     Returns:
         Converted value or None
     """
-    # Convert argument name to env var name
-    # e.g., 'duration' -> 'YT_BUILDER_DURATION'
-    # e.g., 'music-shuffle' -> 'YT_BUILDER_MUSIC_SHUFFLE'
-    env_key = 'YT_BUILDER_' + key.upper().replace('-', '_')
-    value = os.environ.get(env_key)
+    # Argument names map to env var names, e.g. 'music-shuffle' -> 'YT_BUILDER_MUSIC_SHUFFLE'
+    value = _env_snapshot().get(key)
 
     if value is None:
         return None
 
-    # Convert boolean flags
-    if value_type == bool:
-        return value.lower() in ('true', '1', 'yes', 'on')
-
-    # Convert other types
     try:
+        # Convert boolean flags
+        if value_type is bool:
+            return value.lower() in _TRUTHY
+
+        # Convert other types
         return value_type(value)
     except (ValueError, TypeError):
         return None
@@ -53,6 +119,16 @@ def parse_arguments() -> argparse.Namespace:
     """
     Parse command-line arguments and environment variables.
 
+    The result is computed once per process and reused on later calls.
+    """
+    return _build_and_parse()
+
+
+@functools.lru_cache(maxsize=1)
+def _build_and_parse() -> argparse.Namespace:
+    """
+    Build the argument parser and parse command-line arguments.
+
     Environment variables are prefixed with YT_BUILDER_ and use underscores.
     Command-line arguments take precedence over environment variables.
 
@@ -79,31 +155,30 @@ Environment Variables (prefix: YT_BUILDER_):
     )
 
     # Required arguments (can come from env vars)
-    parser.add_argument(
+    duration_action = parser.add_argument(
         '--duration',
         type=float,
-        default=get_env_value('duration', float),
-        required=get_env_value('duration', float) is None,
-        help='Duration of the output video in seconds (env: YT_BUILDER_DURATION)'
+        default=argparse.SUPPRESS,
+        help='Duration of the output video in seconds (required, env: YT_BUILDER_DURATION)'
     )
 
     # Quote timing arguments
     parser.add_argument(
         '--quotes-duration',
         type=float,
-        default=get_env_value('quotes-duration', float) or 5.0,
+        default=argparse.SUPPRESS,
         help='How long to show each quote on screen (seconds, default: 5.0, env: YT_BUILDER_QUOTES_DURATION)'
     )
     parser.add_argument(
         '--quotes-min-between',
         type=float,
-        default=get_env_value('quotes-min-between', float) or 10.0,
+        default=argparse.SUPPRESS,
         help='Minimum time between quotes (seconds, default: 10.0, env: YT_BUILDER_QUOTES_MIN_BETWEEN)'
     )
     parser.add_argument(
         '--quotes-max-between',
         type=float,
-        default=get_env_value('quotes-max-between', float) or 30.0,
+        default=argparse.SUPPRESS,
         help='Maximum time between quotes (seconds, default: 30.0, env: YT_BUILDER_QUOTES_MAX_BETWEEN)'
     )
 
@@ -111,13 +186,13 @@ Environment Variables (prefix: YT_BUILDER_):
     parser.add_argument(
         '--music-shuffle',
         action='store_true',
-        default=get_env_value('music-shuffle', bool) or False,
+        default=argparse.SUPPRESS,
         help='Shuffle music files before combining (env: YT_BUILDER_MUSIC_SHUFFLE)'
     )
     parser.add_argument(
         '--quotes-shuffle',
         action='store_true',
-        default=get_env_value('quotes-shuffle', bool) or False,
+        default=argparse.SUPPRESS,
         help='Shuffle quote files before displaying (env: YT_BUILDER_QUOTES_SHUFFLE)'
     )
 
@@ -125,7 +200,7 @@ Environment Variables (prefix: YT_BUILDER_):
     parser.add_argument(
         '-o', '--output',
         type=str,
-        default=get_env_value('output', str) or 'output.mp4',
+        default=argparse.SUPPRESS,
         help='Output file path (default: output.mp4, env: YT_BUILDER_OUTPUT)'
     )
 
@@ -133,20 +208,20 @@ Environment Variables (prefix: YT_BUILDER_):
     parser.add_argument(
         '--fps',
         type=int,
-        default=get_env_value('fps', int) or 30,
+        default=argparse.SUPPRESS,
         help='Frame rate for output video (default: 30, env: YT_BUILDER_FPS)'
     )
     parser.add_argument(
         '--resolution',
         type=str,
-        default=get_env_value('resolution', str) or '1920x1080',
+        default=argparse.SUPPRESS,
         help='Output resolution in format WIDTHxHEIGHT (default: 1920x1080, env: YT_BUILDER_RESOLUTION)'
     )
     parser.add_argument(
         '--transition',
-        type=str,
-        choices=['none', 'fade', 'crossfade'],
-        default=get_env_value('transition', str) or 'crossfade',
+        type=_choice_type(TRANSITIONS),
+        metavar='{' + ','.join(TRANSITIONS) + '}',
+        default=argparse.SUPPRESS,
         help='Transition effect between video clips (default: crossfade, env: YT_BUILDER_TRANSITION)'
     )
 
@@ -154,28 +229,28 @@ Environment Variables (prefix: YT_BUILDER_):
     parser.add_argument(
         '--music-volume',
         type=float,
-        default=get_env_value('music-volume', float) or 0.7,
+        default=argparse.SUPPRESS,
         help='Volume level for music track (0.0-1.0, default: 0.7, env: YT_BUILDER_MUSIC_VOLUME)'
     )
     parser.add_argument(
         '--sounds-volume',
         type=float,
-        default=get_env_value('sounds-volume', float) or 0.5,
+        default=argparse.SUPPRESS,
         help='Volume level for sound effects (0.0-1.0, default: 0.5, env: YT_BUILDER_SOUNDS_VOLUME)'
     )
 
     # Quote styling
     parser.add_argument(
         '--quote-style',
-        type=str,
-        choices=['minimal', 'centered', 'bottom', 'top'],
-        default=get_env_value('quote-style', str) or 'centered',
+        type=_choice_type(QUOTE_STYLES),
+        metavar='{' + ','.join(QUOTE_STYLES) + '}',
+        default=argparse.SUPPRESS,
         help='Preset quote styling (default: centered, env: YT_BUILDER_QUOTE_STYLE)'
     )
     parser.add_argument(
         '--quote-font',
         type=str,
-        default=get_env_value('quote-font', str) or 'TenPounds',
+        default=argparse.SUPPRESS,
         help='Font to use for quotes. Use font name or path to .ttf/.ttc file (default: TenPounds, env: YT_BUILDER_QUOTE_FONT)'
     )
 
@@ -183,26 +258,49 @@ Environment Variables (prefix: YT_BUILDER_):
     parser.add_argument(
         '--verbose',
         action='store_true',
-        default=get_env_value('verbose', bool) or False,
+        default=argparse.SUPPRESS,
         help='Enable detailed logging output (env: YT_BUILDER_VERBOSE)'
     )
     parser.add_argument(
         '--dry-run',
         action='store_true',
-        default=get_env_value('dry-run', bool) or False,
+        default=argparse.SUPPRESS,
         help='Preview configuration without rendering video (env: YT_BUILDER_DRY_RUN)'
     )
 
-    return parser.parse_args()
+    # Show --duration as required in the usage line; it's enforced after the
+    # environment fallback below, so argparse itself must not require it
+    duration_action.required = True
+    parser.usage = parser.format_usage()[len('usage: '):].rstrip()
+    duration_action.required = False
+
+    args = parser.parse_args()
+
+    # Defaults are resolved only after parsing, so --help never reads the environment:
+    # options not given on the command line fall back to YT_BUILDER_* variables,
+    # then to the built-in default
+    for name, value_type, default in ENV_ARGUMENTS:
+        dest = name.replace('-', '_')
+        if hasattr(args, dest):
+            continue
+        try:
+            value = get_env_value(name, value_type)
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"{ENV_PREFIX}{dest.upper()}: {e}")
+        setattr(args, dest, default if value is None else value)
+
+    if args.duration is None:
+        parser.error('the following arguments are required: --duration')
+
+    return args
 
 
 def parse_resolution(resolution_str: str) -> Tuple[int, int]:
     """Parse resolution string into width and height."""
-    try:
-        width, height = resolution_str.lower().split('x')
-        return int(width), int(height)
-    except (ValueError, AttributeError):
+    match = _RES_RE.match(resolution_str.lower()) if isinstance(resolution_str, str) else None
+    if not match:
         raise ValueError(f"Invalid resolution format: {resolution_str}. Expected WIDTHxHEIGHT")
+    return int(match.group(1)), int(match.group(2))
 
 
 def main():
@@ -267,6 +365,11 @@ def main():
         estimated_size = estimate_output_size(config)
         check_disk_space(Path(config.output_path).parent, estimated_size)
 
+        # Processing modules (Pillow etc.) are only imported when rendering
+        from src.video_processor import VideoProcessor
+        from src.audio_mixer import AudioMixer
+        from src.quote_renderer import QuoteRenderer
+
         # Initialize processors
         logger.info("Initializing video processor...")
         video_processor = VideoProcessor(config)